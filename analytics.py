@@ -0,0 +1,117 @@
+import time
+from collections import deque
+from datetime import datetime
+from config import UTC3_TZ, ANALYTICS_WINDOW, ANALYTICS_TIME_WINDOW, ANALYTICS_LATENCY_WINDOW
+
+
+def win_rate(wins, total):
+    """نسبة الربح كنسبة مئوية"""
+    return round(wins * 100 / total, 1) if total else 0.0
+
+
+class TradeAnalytics:
+    """إحصائيات متجددة للصفقات - كل تحديث O(1) والذاكرة ثابتة"""
+
+    def __init__(self, window_size=ANALYTICS_WINDOW, time_window=ANALYTICS_TIME_WINDOW,
+                 latency_window=ANALYTICS_LATENCY_WINDOW):
+        self.time_window = time_window
+
+        # آخر N صفقة
+        self.recent = deque(maxlen=window_size)
+        self.recent_wins = 0
+
+        # صفقات آخر ساعة - الحجم محدود بالزمن عبر expire()
+        self.timed = deque()
+        self.timed_wins = 0
+
+        # متوسط زمن التنفيذ (الناجح والفاشل)
+        self.latencies = deque(maxlen=latency_window)
+        self.latency_sum = 0.0
+
+        # التوزيع حسب الزوج وساعة اليوم: [رابحة، إجمالي]
+        self.per_pair = {}
+        self.per_hour = [[0, 0] for _ in range(24)]
+
+        # السلاسل: موجب = ربح متتالي، سالب = خسارة متتالية
+        self.current_streak = 0
+        self.best_win_streak = 0
+        self.worst_loss_streak = 0
+
+    def record_trade(self, pair, result, latency=None, when=None):
+        """تسجيل نتيجة صفقة"""
+        win = result == 'WIN'
+        now = time.time()
+        if when is None:
+            when = datetime.now(UTC3_TZ)
+
+        if len(self.recent) == self.recent.maxlen:
+            self.recent_wins -= self.recent[0]
+        self.recent.append(win)
+        self.recent_wins += win
+
+        self.expire(now)
+        self.timed.append((now, win))
+        self.timed_wins += win
+
+        if latency is not None:
+            self.record_latency(latency)
+
+        pair_stats = self.per_pair.setdefault(pair, [0, 0])
+        pair_stats[0] += win
+        pair_stats[1] += 1
+        hour_stats = self.per_hour[when.hour]
+        hour_stats[0] += win
+        hour_stats[1] += 1
+
+        if win:
+            self.current_streak = self.current_streak + 1 if self.current_streak > 0 else 1
+            self.best_win_streak = max(self.best_win_streak, self.current_streak)
+        else:
+            self.current_streak = self.current_streak - 1 if self.current_streak < 0 else -1
+            self.worst_loss_streak = max(self.worst_loss_streak, -self.current_streak)
+
+    def record_latency(self, latency):
+        """تسجيل زمن تنفيذ صفقة سواء نجحت أو فشلت"""
+        if len(self.latencies) == self.latencies.maxlen:
+            self.latency_sum -= self.latencies[0]
+        self.latencies.append(latency)
+        self.latency_sum += latency
+
+    def expire(self, now=None):
+        """حذف صفقات أقدم من النافذة الزمنية"""
+        if now is None:
+            now = time.time()
+        cutoff = now - self.time_window
+        while self.timed and self.timed[0][0] < cutoff:
+            _, win = self.timed.popleft()
+            self.timed_wins -= win
+
+    def best_and_worst_pair(self, min_trades=3):
+        """أفضل وأسوأ زوج حسب نسبة الربح"""
+        eligible = [(win_rate(w, t), pair) for pair, (w, t) in self.per_pair.items() if t >= min_trades]
+        if not eligible:
+            return None, None
+        return max(eligible), min(eligible)
+
+    def best_hour(self, min_trades=3):
+        """أفضل ساعة في اليوم حسب نسبة الربح"""
+        eligible = [(win_rate(w, t), hour) for hour, (w, t) in enumerate(self.per_hour) if t >= min_trades]
+        return max(eligible) if eligible else None
+
+    def summary(self):
+        """ملخص الإحصائيات المتجددة"""
+        self.expire()
+        best_pair, worst_pair = self.best_and_worst_pair()
+        return {
+            'window_trades': len(self.recent),
+            'window_win_rate': win_rate(self.recent_wins, len(self.recent)),
+            'hour_trades': len(self.timed),
+            'hour_win_rate': win_rate(self.timed_wins, len(self.timed)),
+            'current_streak': self.current_streak,
+            'best_win_streak': self.best_win_streak,
+            'worst_loss_streak': self.worst_loss_streak,
+            'avg_latency': round(self.latency_sum / len(self.latencies), 2) if self.latencies else None,
+            'best_pair': best_pair,
+            'worst_pair': worst_pair,
+            'best_hour': self.best_hour(),
+        }
@@ -21,6 +21,33 @@ TRADING_PAIRS = [
 # إعدادات التداول
 TRADE_DURATION = 30
 TRADE_INTERVAL = 3  # كل 3 دقائق
+RESULT_WAIT_MARGIN = 5  # ثواني بعد انتهاء الصفقة قبل قراءة النتيجة
+TRADE_CYCLE_OVERHEAD = 30  # ثواني للإشارة وفتح الصفحة والتنفيذ وقراءة النتيجة
+
+# ملف إعدادات يتم تحميله أثناء التشغيل دون إعادة التشغيل
+# (يمكن أيضًا تمرير TRADING_PAIRS و TRADE_INTERVAL و TRADE_DURATION كمتغيرات بيئة - راجع config_reloader.py)
+CONFIG_OVERRIDES_FILE = os.getenv('CONFIG_OVERRIDES_FILE', 'config_overrides.json')
 
 # توقيت UTC+3 (توقيت مصر)
 UTC3_TZ = timezone('Africa/Cairo')
+
+# إعدادات التسجيل
+LOG_FILE = os.getenv('LOG_FILE', 'logs/bot.jsonl')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 5 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 3))
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 50
+LOG_FLUSH_INTERVAL = 1.0  # ثانية
+LOG_TO_STDOUT = os.getenv('LOG_TO_STDOUT', '1') == '1'
+LOG_SUMMARY_INTERVAL = 600  # ملخص حالة كل 10 دقائق
+
+# إعدادات التحليلات
+ANALYTICS_WINDOW = 50  # آخر N صفقة
+ANALYTICS_TIME_WINDOW = 3600  # آخر ساعة بالثواني
+ANALYTICS_LATENCY_WINDOW = 100
+
+# إعدادات اختيار الأزواج
+PAIR_STATS_FILE = os.getenv('PAIR_STATS_FILE', 'data/pair_stats.json')
+PAIR_STATS_DECAY = 0.98  # تقليل وزن النتائج القديمة
+PAIR_LATENCY_ALPHA = 0.2  # معامل المتوسط المتحرك لزمن اختيار الزوج
+PAIR_LATENCY_REFERENCE = 10.0  # ثانية
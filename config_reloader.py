@@ -0,0 +1,140 @@
+import os
+import re
+import json
+import logging
+import config
+from config import CONFIG_OVERRIDES_FILE, RESULT_WAIT_MARGIN, TRADE_CYCLE_OVERHEAD
+
+PAIR_PATTERN = re.compile(r'^[A-Z]{3}/[A-Z]{2,4}$')
+
+# الإعدادات التي يمكن تغييرها أثناء التشغيل
+RELOADABLE_KEYS = ('TRADING_PAIRS', 'TRADE_INTERVAL', 'TRADE_DURATION', 'CHANNEL_ID')
+
+# الإعدادات التي يمكن تمريرها كمتغيرات بيئة عند بدء التشغيل
+ENV_PARSERS = {
+    'TRADING_PAIRS': lambda value: [pair.strip() for pair in value.split(',') if pair.strip()],
+    'TRADE_INTERVAL': int,
+    'TRADE_DURATION': int,
+}
+
+
+def validate_overrides(data):
+    """التحقق من صحة الإعدادات الجديدة وإرجاع القيم المسموح بها فقط"""
+    if not isinstance(data, dict):
+        raise ValueError("ملف الإعدادات يجب أن يكون كائن JSON")
+
+    unknown = set(data) - set(RELOADABLE_KEYS)
+    if unknown:
+        raise ValueError(f"إعدادات غير معروفة: {', '.join(sorted(unknown))}")
+
+    if 'TRADING_PAIRS' in data:
+        pairs = data['TRADING_PAIRS']
+        if not isinstance(pairs, list) or not pairs:
+            raise ValueError("TRADING_PAIRS يجب أن تكون قائمة غير فارغة")
+        invalid = [pair for pair in pairs if not isinstance(pair, str) or not PAIR_PATTERN.match(pair)]
+        if invalid:
+            raise ValueError(f"أزواج غير صالحة: {invalid}")
+
+    if 'TRADE_INTERVAL' in data:
+        interval = data['TRADE_INTERVAL']
+        if not isinstance(interval, int) or isinstance(interval, bool) or interval < 1 or 60 % interval:
+            raise ValueError("TRADE_INTERVAL يجب أن يكون عدد دقائق يقسم 60")
+
+    if 'TRADE_DURATION' in data:
+        duration = data['TRADE_DURATION']
+        if not isinstance(duration, int) or isinstance(duration, bool) or duration < 5:
+            raise ValueError("TRADE_DURATION يجب أن يكون 5 ثواني على الأقل")
+
+    if 'CHANNEL_ID' in data:
+        channel_id = data['CHANNEL_ID']
+        if not isinstance(channel_id, (str, int)) or isinstance(channel_id, bool) or not str(channel_id).strip():
+            raise ValueError("CHANNEL_ID غير صالح")
+
+    return data
+
+
+def validate_timing(settings):
+    """التأكد من أن الصفقة ونتيجتها تنتهي قبل الموعد التالي"""
+    needed = settings['TRADE_DURATION'] + RESULT_WAIT_MARGIN + TRADE_CYCLE_OVERHEAD
+    available = settings['TRADE_INTERVAL'] * 60
+    if needed > available:
+        raise ValueError(
+            f"TRADE_DURATION={settings['TRADE_DURATION']} لا تنتهي خلال TRADE_INTERVAL={settings['TRADE_INTERVAL']} "
+            f"(مطلوب {needed} ثانية والمتاح {available})"
+        )
+    return settings
+
+
+def config_defaults():
+    """القيم الافتراضية من config.py"""
+    return {key: getattr(config, key) for key in RELOADABLE_KEYS}
+
+
+def env_overrides(environ=os.environ):
+    """قراءة الإعدادات من متغيرات البيئة - القيم غير الصالحة يتم تجاهلها"""
+    overrides = {}
+    for key, parse in ENV_PARSERS.items():
+        raw = environ.get(key)
+        if not raw:
+            continue
+        try:
+            overrides.update(validate_overrides({key: parse(raw)}))
+        except Exception as e:
+            logging.error(f"❌ تم تجاهل متغير البيئة {key}={raw!r} واستخدام القيمة الافتراضية: {e}")
+    return overrides
+
+
+class ConfigReloader:
+    """مراقبة ملف الإعدادات وإرجاع التغييرات الصالحة فقط
+
+    القيم المطبقة = config.py + متغيرات البيئة + ملف الإعدادات، لذلك حذف مفتاح
+    من الملف (أو حذف الملف) يعيده إلى قيمته الأساسية.
+    """
+
+    def __init__(self, path=CONFIG_OVERRIDES_FILE):
+        self.path = path
+        self.last_mtime = None
+        self.polled = False
+        # القيم التي تم بناء المكونات بها
+        self.current = config_defaults()
+        self.baseline = dict(self.current)
+        self.baseline.update(env_overrides())
+        try:
+            validate_timing(self.baseline)
+        except ValueError as e:
+            logging.error(f"❌ تم تجاهل TRADE_INTERVAL و TRADE_DURATION من متغيرات البيئة: {e}")
+            self.baseline['TRADE_INTERVAL'] = self.current['TRADE_INTERVAL']
+            self.baseline['TRADE_DURATION'] = self.current['TRADE_DURATION']
+
+    def poll(self):
+        """التحقق من تعديل الملف - يرجع التغييرات أو None"""
+        mtime = None
+        if self.path:
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                mtime = None
+        if self.polled and mtime == self.last_mtime:
+            return None
+        self.polled = True
+        self.last_mtime = mtime
+
+        overrides = {}
+        if mtime is not None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    overrides = validate_overrides(json.load(f))
+            except Exception as e:
+                logging.error(f"❌ تم تجاهل ملف الإعدادات {self.path}: {e}")
+                return None
+
+        desired = dict(self.baseline)
+        desired.update(overrides)
+        try:
+            validate_timing(desired)
+        except ValueError as e:
+            logging.error(f"❌ تم تجاهل ملف الإعدادات {self.path}: {e}")
+            return None
+        changes = {key: value for key, value in desired.items() if self.current.get(key) != value}
+        self.current = desired
+        return changes or None
@@ -0,0 +1,299 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from config import (
+    UTC3_TZ, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_QUEUE_SIZE,
+    LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL, LOG_TO_STDOUT
+)
+
+# الحقول المهيكلة التي تُضاف لكل سجل إن وُجدت
+STRUCTURED_FIELDS = ('trade_id', 'pair', 'step', 'duration', 'status')
+
+_STOP = object()
+
+
+class JsonLineFormatter(logging.Formatter):
+    """تحويل السجل إلى سطر JSON واحد"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, UTC3_TZ).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'msg': record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        extra_data = getattr(record, 'data', None)
+        if extra_data:
+            entry['data'] = extra_data
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """وضع السجلات في الطابور فقط دون انتظار - يتم إسقاط السجل إذا امتلأ الطابور"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record):
+        # تثبيت نص الرسالة والخطأ قبل نقل السجل لخيط الكتابة
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonLogWriter(threading.Thread):
+    """خيط خلفي يكتب السجلات على دفعات مع تدوير الملف حسب الحجم"""
+
+    def __init__(self, log_queue, path, max_bytes, backup_count, batch_size, flush_interval, echo_stdout):
+        super().__init__(name='log-writer', daemon=True)
+        self.queue = log_queue
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.echo_stdout = echo_stdout
+        self.formatter = JsonLineFormatter()
+        self.stream = None
+        self.size = 0
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+        self.open_file()
+
+    def open_file(self):
+        """فتح ملف السجل"""
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.stream = open(self.path, 'a', encoding='utf-8')
+            self.size = self.stream.tell()
+        except OSError as e:
+            sys.stderr.write(f"❌ تعذر فتح ملف السجل {self.path}: {e}\n")
+            self.stream = None
+
+    def rotate(self):
+        """تدوير ملف السجل: bot.jsonl -> bot.jsonl.1 -> bot.jsonl.2 ..."""
+        self.stream.close()
+        self.stream = None
+        try:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            if self.backup_count > 0:
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+        except OSError as e:
+            sys.stderr.write(f"⚠️ خطأ في تدوير ملف السجل: {e}\n")
+        self.rotations += 1
+        self.open_file()
+
+    def collect_batch(self):
+        """جمع دفعة من السجلات حتى امتلائها أو انتهاء مهلة التفريغ"""
+        first = self.queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                record = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if record is _STOP:
+                return batch, True
+            batch.append(record)
+        return batch, False
+
+    def write_batch(self, batch):
+        """كتابة الدفعة دفعة واحدة"""
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception as e:
+                lines.append(json.dumps({'level': 'ERROR', 'msg': f"تعذر تنسيق السجل: {e}"}))
+        payload = '\n'.join(lines) + '\n'
+
+        if self.echo_stdout:
+            try:
+                sys.stdout.write(payload)
+                sys.stdout.flush()
+            except Exception:
+                pass
+
+        if self.stream:
+            try:
+                self.stream.write(payload)
+                self.stream.flush()
+                self.size += len(payload.encode('utf-8'))
+                if self.max_bytes and self.size >= self.max_bytes:
+                    self.rotate()
+            except OSError as e:
+                sys.stderr.write(f"❌ خطأ في كتابة السجل: {e}\n")
+
+    def run(self):
+        stop = False
+        while not stop:
+            batch, stop = self.collect_batch()
+            if batch:
+                self.write_batch(batch)
+                # تحرير السجلات قبل تحديث العداد حتى يعني drain() أنها لم تعد في الذاكرة
+                count = len(batch)
+                batch = None
+                self.batches += 1
+                self.written += count
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+
+class LoggingPipeline:
+    """خط تسجيل غير متزامن: المسار الساخن يضع السجلات في طابور فقط"""
+
+    def __init__(self, path=LOG_FILE, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                 queue_size=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL, echo_stdout=LOG_TO_STDOUT):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.writer = JsonLogWriter(
+            self.queue, path, max_bytes, backup_count,
+            batch_size, flush_interval, echo_stdout
+        )
+        self.started_at = time.time()
+
+    def start(self, level=logging.INFO):
+        """ربط الطابور بالـ root logger وتشغيل خيط الكتابة"""
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(level)
+        self.writer.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout=5):
+        """تفريغ ما تبقى في الطابور وإيقاف خيط الكتابة"""
+        if not self.writer.is_alive():
+            return
+        logging.getLogger().removeHandler(self.handler)
+        self.queue.put(_STOP)
+        self.writer.join(timeout)
+
+    def drain(self, timeout=5):
+        """انتظار كتابة كل السجلات الموجودة في الطابور"""
+        deadline = time.monotonic() + timeout
+        while self.writer.written < self.handler.enqueued:
+            if time.monotonic() >= deadline or not self.writer.is_alive():
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self):
+        """إحصائيات خط التسجيل"""
+        return {
+            'uptime': int(time.time() - self.started_at),
+            'written': self.writer.written,
+            'dropped': self.handler.dropped,
+            'pending': self.queue.qsize(),
+            'batches': self.writer.batches,
+            'rotations': self.writer.rotations,
+        }
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def setup_logging(**kwargs):
+    """تهيئة خط التسجيل مرة واحدة فقط"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LoggingPipeline(**kwargs)
+            _pipeline.start()
+        return _pipeline
+
+
+def get_pipeline():
+    """الحصول على خط التسجيل الحالي إن وُجد"""
+    return _pipeline
+
+
+def log_event(message, step=None, trade_id=None, pair=None, duration=None, status=None,
+              level=logging.INFO, **data):
+    """تسجيل حدث مهيكل"""
+    extra = {'step': step, 'trade_id': trade_id, 'pair': pair, 'duration': duration, 'status': status}
+    if data:
+        extra['data'] = data
+    logging.log(level, message, extra=extra)
+
+
+class StepOutcome:
+    """نتيجة خطوة داخل trade_step - الخطوات التي ترجع False تُسجل كفشل"""
+
+    __slots__ = ('ok',)
+
+    def __init__(self):
+        self.ok = True
+
+    def fail(self):
+        self.ok = False
+
+    def check(self, value):
+        """تسجيل الخطوة كفاشلة إذا كانت القيمة False أو فارغة، وإرجاع القيمة كما هي"""
+        if not value:
+            self.ok = False
+        return value
+
+
+@contextmanager
+def trade_step(step, trade_id=None, pair=None):
+    """قياس مدة خطوة من خطوات الصفقة وتسجيلها كسجل مهيكل (status = ok أو error)"""
+    start = time.perf_counter()
+    outcome = StepOutcome()
+    status = 'ok'
+    try:
+        yield outcome
+    except BaseException:
+        outcome.fail()
+        raise
+    finally:
+        if not outcome.ok:
+            status = 'error'
+        duration = round(time.perf_counter() - start, 3)
+        log_event(f"⏱ {step}", step=step, trade_id=trade_id, pair=pair, duration=duration,
+                  status=status, level=logging.INFO if status == 'ok' else logging.ERROR)
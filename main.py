@@ -1,29 +1,41 @@
 from telegram_bot import TelegramBot
 from simple_scheduler import SimpleTradingScheduler
+from log_pipeline import setup_logging, log_event
+from config import LOG_SUMMARY_INTERVAL
 import logging
 import threading
 import time
-import sys
 
-# إعداد التسجيل
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-    ]
-)
+# إعداد التسجيل غير المتزامن
+pipeline = setup_logging()
 
 logger = logging.getLogger(__name__)
 
+# الجدولة الحالية (تُستخدم في الملخص الدوري)
+active_scheduler = None
+
 def keep_alive_output():
-    """إرسال output مستمر"""
+    """ملخص دوري مختصر لحالة النظام بدل سطر كل 30 ثانية"""
     while True:
-        logger.info("🔄 النظام يعمل بشكل طبيعي...")
-        time.sleep(30)
+        time.sleep(LOG_SUMMARY_INTERVAL)
+        stats = {'log_' + key: value for key, value in pipeline.stats().items()}
+        if active_scheduler is None:
+            log_event("📋 ملخص: جاري تهيئة الجدولة", step='summary', **stats)
+            continue
+        stats.update(active_scheduler.status_summary())
+        log_event(
+            f"📋 ملخص: يعمل منذ {stats['log_uptime'] // 60}m - "
+            f"صفقات {stats['total_trades']} - "
+            f"{'صفقة جارية' if stats['trade_in_progress'] else 'في الانتظار'} - "
+            f"القادمة {stats['next_trade_time']} - "
+            f"سجلات مفقودة {stats['log_dropped']}",
+            step='summary',
+            **stats
+        )
 
 def main():
     """الدالة الرئيسية"""
+    global active_scheduler
     try:
         logger.info("⏳ جاري تهيئة النظام...")
         
@@ -45,6 +57,7 @@ def main():
         # تشغيل الجدولة المبسطة
         logger.info("⏰ جاري تشغيل جدولة المهام المبسطة...")
         scheduler = SimpleTradingScheduler()
+        active_scheduler = scheduler
         scheduler.run()
         
     except Exception as e:
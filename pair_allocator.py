@@ -0,0 +1,104 @@
+import os
+import json
+import random
+import logging
+from config import PAIR_STATS_FILE, PAIR_STATS_DECAY, PAIR_LATENCY_ALPHA, PAIR_LATENCY_REFERENCE
+
+
+class PairStats:
+    """إحصائيات زوج واحد"""
+
+    __slots__ = ('wins', 'losses', 'executions', 'failures', 'latency')
+
+    def __init__(self, wins=0.0, losses=0.0, executions=0.0, failures=0.0, latency=None):
+        self.wins = wins
+        self.losses = losses
+        self.executions = executions
+        self.failures = failures
+        self.latency = latency
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class PairAllocator:
+    """اختيار الأزواج بأسلوب Thompson sampling حسب الربح ونجاح التنفيذ والسرعة"""
+
+    def __init__(self, pairs, state_file=PAIR_STATS_FILE, decay=PAIR_STATS_DECAY,
+                 latency_alpha=PAIR_LATENCY_ALPHA, latency_reference=PAIR_LATENCY_REFERENCE):
+        self.state_file = state_file
+        self.decay = decay
+        self.latency_alpha = latency_alpha
+        self.latency_reference = latency_reference
+        self.stats = {}
+        self.load()
+        self.set_pairs(pairs)
+
+    def set_pairs(self, pairs):
+        """تحديث قائمة الأزواج مع الاحتفاظ بإحصائيات الأزواج الموجودة"""
+        self.pairs = list(pairs)
+        for pair in self.pairs:
+            self.stats.setdefault(pair, PairStats())
+
+    def score(self, pair):
+        """عينة عشوائية من توزيع أداء الزوج"""
+        s = self.stats[pair]
+        win_sample = random.betavariate(s.wins + 1, s.losses + 1)
+        success_sample = random.betavariate(s.executions - s.failures + 1, s.failures + 1)
+        speed = 1.0
+        if s.latency is not None:
+            speed = self.latency_reference / (self.latency_reference + s.latency)
+        return win_sample * success_sample * speed
+
+    def choose(self):
+        """اختيار الزوج صاحب أعلى عينة"""
+        return max(self.pairs, key=self.score)
+
+    def record_execution(self, pair, success, latency=None):
+        """تسجيل نجاح أو فشل تنفيذ الصفقة وزمن اختيار الزوج"""
+        s = self.stats.setdefault(pair, PairStats())
+        s.executions = s.executions * self.decay + 1
+        s.failures = s.failures * self.decay + (0 if success else 1)
+        if latency is not None:
+            if s.latency is None:
+                s.latency = latency
+            else:
+                s.latency += self.latency_alpha * (latency - s.latency)
+
+    def record_result(self, pair, result):
+        """تسجيل نتيجة الصفقة"""
+        s = self.stats.setdefault(pair, PairStats())
+        s.wins *= self.decay
+        s.losses *= self.decay
+        if result == 'WIN':
+            s.wins += 1
+        else:
+            s.losses += 1
+
+    def load(self):
+        """تحميل الحالة المحفوظة"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                data = json.load(f)
+            self.stats = {pair: PairStats(**values) for pair, values in data.items()}
+            logging.info(f"✅ تم تحميل إحصائيات {len(self.stats)} زوج")
+        except Exception as e:
+            logging.warning(f"⚠️ خطأ في تحميل إحصائيات الأزواج: {e}")
+            self.stats = {}
+
+    def save(self):
+        """حفظ الحالة بشكل آمن (كتابة ملف مؤقت ثم استبداله) - مرة واحدة لكل دورة"""
+        if not self.state_file:
+            return
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({pair: s.to_dict() for pair, s in self.stats.items()}, f, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logging.warning(f"⚠️ خطأ في حفظ إحصائيات الأزواج: {e}")
@@ -1,7 +1,8 @@
 import time
 import logging
 import random
-from config import QX_EMAIL, QX_PASSWORD, QX_LOGIN_URL
+from config import QX_EMAIL, QX_PASSWORD, QX_LOGIN_URL, TRADE_DURATION, RESULT_WAIT_MARGIN
+from log_pipeline import trade_step, log_event
 
 try:
     from playwright.sync_api import sync_playwright
@@ -11,13 +12,21 @@ except ImportError:
     logging.warning("⚠️ Playwright غير مثبت، سيتم استخدام وضع المحاكاة")
 
 class QXBrokerManager:
-    def __init__(self):
+    def __init__(self, use_browser=True):
         self.playwright = None
         self.browser = None
         self.page = None
         self.is_logged_in = False
         self.last_activity = time.time()
-        self.setup_browser()
+        self.last_selection_latency = None
+        self.time_scale = 1.0  # معامل مدة الانتظار (0 في اختبار التحمل)
+        if use_browser:
+            self.setup_browser()
+    
+    def wait(self, seconds):
+        """انتظار بين خطوات الواجهة"""
+        if self.time_scale:
+            time.sleep(seconds * self.time_scale)
     
     def setup_browser(self):
         """إعداد المتصفح باستخدام Playwright"""
@@ -84,7 +93,7 @@ class QXBrokerManager:
                 return False
                 
             self.page.goto("https://qxbroker.com/ar/demo-trade", wait_until="networkidle")
-            time.sleep(3)
+            self.wait(3)
             
             if self.check_login_status():
                 self.is_logged_in = True
@@ -130,25 +139,25 @@ class QXBrokerManager:
                 return False
                 
             self.page.goto("https://qxbroker.com/ar/sign-in", wait_until="networkidle")
-            time.sleep(3)
+            self.wait(3)
             
             # إدخال البريد الإلكتروني
             email_field = self.page.query_selector("input[type='email'], input[name='email']")
             if email_field:
                 email_field.fill(QX_EMAIL)
-                time.sleep(1)
+                self.wait(1)
             
             # إدخال كلمة المرور
             password_field = self.page.query_selector("input[type='password'], input[name='password']")
             if password_field:
                 password_field.fill(QX_PASSWORD)
-                time.sleep(1)
+                self.wait(1)
             
             # النقر على زر الدخول
             login_button = self.page.query_selector("button[type='submit'], text=تسجيل, text=دخول")
             if login_button:
                 login_button.click()
-                time.sleep(5)
+                self.wait(5)
                 
                 if self.check_login_status():
                     self.is_logged_in = True
@@ -161,11 +170,13 @@ class QXBrokerManager:
             logging.error(f"❌ خطأ في تسجيل الدخول: {e}")
             return False
 
-    def execute_trade(self, pair, direction, duration=30):
+    def execute_trade(self, pair, direction, duration=30, trade_id=None):
         """تنفيذ صفقة حقيقية"""
+        self.last_selection_latency = None
         if not self.browser:
-            logging.info(f"🎮 وضع المحاكاة - صفقة {direction} على {pair}")
-            time.sleep(2)
+            log_event(f"🎮 وضع المحاكاة - صفقة {direction} على {pair}",
+                      step='simulate', trade_id=trade_id, pair=pair)
+            self.wait(2)
             return True
             
         try:
@@ -175,31 +186,43 @@ class QXBrokerManager:
             if not self.is_logged_in and not self.ensure_login():
                 return False
             
-            self.page.goto("https://qxbroker.com/ar/demo-trade", wait_until="networkidle")
-            time.sleep(3)
+            with trade_step('open_trade_page', trade_id, pair):
+                self.page.goto("https://qxbroker.com/ar/demo-trade", wait_until="networkidle")
+                self.wait(3)
             
-            logging.info(f"📊 جاري تنفيذ صفقة: {pair} - {direction}")
+            log_event(f"📊 جاري تنفيذ صفقة: {pair} - {direction}",
+                      step='place', trade_id=trade_id, pair=pair)
             
             # البحث عن الزوج
-            if not self.search_and_select_pair(pair):
+            selection_start = time.perf_counter()
+            with trade_step('select_pair', trade_id, pair) as step:
+                selected = step.check(self.search_and_select_pair(pair))
+            self.last_selection_latency = time.perf_counter() - selection_start
+            if not selected:
                 return False
             
             # تحديد المدة
-            self.set_duration(duration)
+            with trade_step('set_duration', trade_id, pair):
+                self.set_duration(duration)
             
             # تحديد المبلغ
-            self.set_amount(1)
+            with trade_step('set_amount', trade_id, pair):
+                self.set_amount(1)
             
             # تنفيذ الصفقة
-            if not self.execute_direction(direction):
+            with trade_step('place_order', trade_id, pair) as step:
+                placed = step.check(self.execute_direction(direction))
+            if not placed:
                 return False
             
-            logging.info(f"🎯 تم تنفيذ صفقة {direction} على {pair} بنجاح")
+            log_event(f"🎯 تم تنفيذ صفقة {direction} على {pair} بنجاح",
+                      step='placed', trade_id=trade_id, pair=pair)
             self.last_activity = time.time()
             return True
             
         except Exception as e:
-            logging.error(f"❌ خطأ في تنفيذ الصفقة: {e}")
+            log_event(f"❌ خطأ في تنفيذ الصفقة: {e}", step='place',
+                      trade_id=trade_id, pair=pair, level=logging.ERROR)
             return False
 
     def search_and_select_pair(self, pair):
@@ -212,20 +235,20 @@ class QXBrokerManager:
             plus_button = self.page.query_selector("text='+'")
             if plus_button:
                 plus_button.click()
-                time.sleep(2)
+                self.wait(2)
             
             # البحث عن شريط البحث
             search_box = self.page.query_selector("input[placeholder*='بحث'], input[placeholder*='search']")
             if search_box:
                 search_pair = pair.replace('/', '').upper()
                 search_box.fill(search_pair)
-                time.sleep(3)
+                self.wait(3)
             
             # اختيار الزوج
             pair_element = self.page.query_selector(f"text='{pair}'")
             if pair_element:
                 pair_element.click()
-                time.sleep(3)
+                self.wait(3)
                 return True
             
             return False
@@ -243,7 +266,7 @@ class QXBrokerManager:
             duration_button = self.page.query_selector(f"text='{duration}'")
             if duration_button:
                 duration_button.click()
-                time.sleep(1)
+                self.wait(1)
         except Exception as e:
             logging.warning(f"⚠️ خطأ في تحديد المدة: {e}")
 
@@ -256,7 +279,7 @@ class QXBrokerManager:
             amount_input = self.page.query_selector("input[type='number']")
             if amount_input:
                 amount_input.fill(str(amount))
-                time.sleep(1)
+                self.wait(1)
         except Exception as e:
             logging.warning(f"⚠️ خطأ في تحديد المبلغ: {e}")
 
@@ -270,13 +293,13 @@ class QXBrokerManager:
                 buy_button = self.page.query_selector("text=صاعد, text=UP, text=شراء")
                 if buy_button:
                     buy_button.click()
-                    time.sleep(3)
+                    self.wait(3)
                     return True
             else:
                 sell_button = self.page.query_selector("text=هابط, text=DOWN, text=بيع")
                 if sell_button:
                     sell_button.click()
-                    time.sleep(3)
+                    self.wait(3)
                     return True
             
             return False
@@ -285,8 +308,8 @@ class QXBrokerManager:
             logging.error(f"❌ خطأ في تنفيذ الاتجاه: {e}")
             return False
 
-    def get_trade_result(self):
-        """الحصول على نتيجة الصفقة"""
+    def get_trade_result(self, duration=TRADE_DURATION):
+        """الحصول على نتيجة الصفقة بعد انتهاء مدتها"""
         if not self.browser:
             result = random.choice(['WIN', 'LOSS'])
             logging.info(f"🎮 وضع المحاكاة - نتيجة: {result}")
@@ -294,13 +317,13 @@ class QXBrokerManager:
             
         try:
             logging.info("⏳ في انتظار نتيجة الصفقة...")
-            time.sleep(35)
+            self.wait(duration + RESULT_WAIT_MARGIN)
             
             if not self.ensure_page():
                 return random.choice(['WIN', 'LOSS'])
                 
             self.page.goto("https://qxbroker.com/ar/demo-trade", wait_until="networkidle")
-            time.sleep(3)
+            self.wait(3)
             
             # البحث عن النتيجة
             page_content = self.page.content()
@@ -327,7 +350,7 @@ class QXBrokerManager:
                 if not self.ensure_page():
                     return False
                 self.page.goto("https://qxbroker.com/ar/demo-trade")
-                time.sleep(3)
+                self.wait(3)
             return True
         except Exception as e:
             logging.error(f"❌ خطأ في الحفاظ على النشاط: {e}")
@@ -1,22 +1,30 @@
 import time
 import logging
 from datetime import datetime, timedelta
-from config import UTC3_TZ
+from config import UTC3_TZ, TRADE_INTERVAL
+from log_pipeline import trade_step, log_event
 
 class SimpleTradingScheduler:
-    def __init__(self):
+    def __init__(self, qx_manager=None, telegram_bot=None, trading_engine=None):
         from qx_broker import QXBrokerManager
         from telegram_bot import TelegramBot
         from trading_engine import TradingEngine
+        from analytics import TradeAnalytics
+        from config_reloader import ConfigReloader
         
-        self.qx_manager = QXBrokerManager()
-        self.telegram_bot = TelegramBot()
-        self.trading_engine = TradingEngine()
+        self.qx_manager = qx_manager or QXBrokerManager()
+        self.telegram_bot = telegram_bot or TelegramBot()
+        self.trading_engine = trading_engine or TradingEngine()
+        self.analytics = TradeAnalytics()
+        self.config_reloader = ConfigReloader()
+        self.trade_interval = TRADE_INTERVAL
+        self.signal_lead_time = 5  # ثواني بين الإشارة والتنفيذ
         
         self.stats = {
             'total_trades': 0,
             'win_trades': 0,
             'loss_trades': 0,
+            'failed_trades': 0,
             'net_profit': 0,
             'session_start': datetime.now(UTC3_TZ),
             'last_trade_time': None
@@ -32,8 +40,8 @@ class SimpleTradingScheduler:
     def calculate_next_trade_time(self):
         """حساب وقت الصفقة التالية"""
         now = self.get_utc3_time()
-        # الصفقات كل 3 دقائق (0, 3, 6, 9, ...)
-        next_minute = ((now.minute // 3) + 1) * 3
+        # الصفقات كل TRADE_INTERVAL دقائق (0, 3, 6, 9, ...)
+        next_minute = ((now.minute // self.trade_interval) + 1) * self.trade_interval
         if next_minute >= 60:
             next_minute = 0
             next_hour = now.hour + 1
@@ -46,6 +54,27 @@ class SimpleTradingScheduler:
             
         return next_trade
     
+    def reload_config(self):
+        """تطبيق تعديلات ملف الإعدادات دون إعادة تشغيل المتصفح"""
+        changes = self.config_reloader.poll()
+        if not changes:
+            return False
+        
+        if 'TRADING_PAIRS' in changes:
+            self.trading_engine.update_pairs(changes['TRADING_PAIRS'])
+        if 'TRADE_DURATION' in changes:
+            self.trading_engine.duration = changes['TRADE_DURATION']
+        if 'CHANNEL_ID' in changes:
+            self.telegram_bot.channel_id = changes['CHANNEL_ID']
+        if 'TRADE_INTERVAL' in changes:
+            self.trade_interval = changes['TRADE_INTERVAL']
+            if self.next_trade_time:
+                self.next_trade_time = self.calculate_next_trade_time()
+        
+        log_event(f"🔧 تم تطبيق إعدادات جديدة: {', '.join(sorted(changes))}",
+                  step='config_reload', **changes)
+        return True
+    
     def start_24h_trading(self):
         """بدء التداول 24 ساعة"""
         logging.info("🚀 بدء التداول 24 ساعة بتوقيت UTC+3...")
@@ -54,7 +83,7 @@ class SimpleTradingScheduler:
         self.telegram_bot.send_message(
             f"🎯 <b>بدء تشغيل البوت بنجاح!</b>\n\n"
             f"📊 البوت يعمل الآن 24 ساعة\n"
-            f"🔄 صفقة كل 3 دقائق\n"
+            f"🔄 صفقة كل {self.trade_interval} دقائق\n"
             f"⏰ الوقت الحالي: {current_time} (UTC+3)\n\n"
             f"🚀 <i>استعد لفرص ربح مستمرة!</i>"
         )
@@ -71,36 +100,49 @@ class SimpleTradingScheduler:
             self.trade_in_progress = True
             
             # تحليل واتخاذ قرار
-            trade_data = self.trading_engine.analyze_and_decide()
+            trade_id = self.get_utc3_time().strftime("%Y%m%d-%H%M")
+            with trade_step('analyze', trade_id):
+                trade_data = self.trading_engine.analyze_and_decide()
+            pair = trade_data['pair']
             trade_time = self.get_utc3_time().strftime("%H:%M:%S")
             
             # إرسال إشارة الصفقة
-            self.telegram_bot.send_trade_signal(
-                trade_data['pair'],
-                trade_data['direction'],
-                trade_time
-            )
+            with trade_step('send_signal', trade_id, pair):
+                self.telegram_bot.send_trade_signal(
+                    pair,
+                    trade_data['direction'],
+                    trade_time,
+                    trade_data['duration']
+                )
             
-            logging.info(f"📤 إشارة صفقة: {trade_data['pair']} - {trade_data['direction']} - {trade_time} (UTC+3)")
+            log_event(f"📤 إشارة صفقة: {pair} - {trade_data['direction']} - {trade_time} (UTC+3)",
+                      step='signal', trade_id=trade_id, pair=pair, direction=trade_data['direction'])
             
             # تنفيذ الصفقة بعد 5 ثواني (بدل 60)
-            time.sleep(5)
+            time.sleep(self.signal_lead_time)
             
             # تنفيذ الصفقة في المنصة
-            success = self.qx_manager.execute_trade(
-                trade_data['pair'],
-                trade_data['direction'],
-                trade_data['duration']
-            )
+            execution_start = time.perf_counter()
+            with trade_step('execute', trade_id, pair) as step:
+                success = step.check(self.qx_manager.execute_trade(
+                    pair,
+                    trade_data['direction'],
+                    trade_data['duration'],
+                    trade_id=trade_id
+                ))
+            self.analytics.record_latency(time.perf_counter() - execution_start)
+            # لا يُحسب الفشل على الزوج إلا إذا وصل التنفيذ لمرحلة اختيار الزوج
+            selection_latency = self.qx_manager.last_selection_latency
+            if success or selection_latency is not None:
+                self.trading_engine.record_execution(pair, success, selection_latency)
             
             if success:
-                logging.info(f"✅ تم تنفيذ صفقة: {trade_data['pair']} - {trade_data['direction']}")
-                
-                # انتظار النتيجة
-                time.sleep(35)
+                log_event(f"✅ تم تنفيذ صفقة: {pair} - {trade_data['direction']}",
+                          step='executed', trade_id=trade_id, pair=pair)
                 
-                # الحصول على النتيجة
-                result = self.qx_manager.get_trade_result()
+                # الحصول على النتيجة (الانتظار حسب مدة الصفقة المطبقة)
+                with trade_step('get_result', trade_id, pair):
+                    result = self.qx_manager.get_trade_result(trade_data['duration'])
                 
                 # تحديث الإحصائيات
                 self.stats['total_trades'] += 1
@@ -109,22 +151,30 @@ class SimpleTradingScheduler:
                 else:
                     self.stats['loss_trades'] += 1
                 self.stats['net_profit'] = self.stats['win_trades'] - self.stats['loss_trades']
+                self.analytics.record_trade(pair, result)
+                self.trading_engine.record_result(pair, result)
                 
                 # إرسال النتيجة
-                self.telegram_bot.send_trade_result(
-                    trade_data['pair'],
-                    result,
-                    self.stats
-                )
+                with trade_step('send_result', trade_id, pair):
+                    self.telegram_bot.send_trade_result(
+                        pair,
+                        result,
+                        self.stats,
+                        self.analytics.summary()
+                    )
                 
-                logging.info(f"🎯 نتيجة صفقة: {trade_data['pair']} - {result}")
+                log_event(f"🎯 نتيجة صفقة: {pair} - {result}",
+                          step='result', trade_id=trade_id, pair=pair, result=result)
                 
             else:
-                logging.error(f"❌ فشل تنفيذ الصفقة: {trade_data['pair']}")
+                self.stats['failed_trades'] += 1
+                log_event(f"❌ فشل تنفيذ الصفقة: {pair}", step='failed',
+                          trade_id=trade_id, pair=pair, level=logging.ERROR)
                 
         except Exception as e:
             logging.error(f"❌ خطأ في دورة الصفقة: {e}")
         finally:
+            self.trading_engine.save_state()
             self.trade_in_progress = False
             self.stats['last_trade_time'] = self.get_utc3_time()
     
@@ -144,6 +194,19 @@ class SimpleTradingScheduler:
         except Exception as e:
             logging.error(f"❌ خطأ في الحفاظ على النشاط: {e}")
     
+    def status_summary(self):
+        """حالة الجدولة المختصرة للملخص الدوري"""
+        last_trade = self.stats['last_trade_time']
+        return {
+            'total_trades': self.stats['total_trades'],
+            'win_trades': self.stats['win_trades'],
+            'loss_trades': self.stats['loss_trades'],
+            'failed_trades': self.stats['failed_trades'],
+            'trade_in_progress': self.trade_in_progress,
+            'next_trade_time': self.next_trade_time.strftime('%H:%M:%S') if self.next_trade_time else None,
+            'last_trade_time': last_trade.strftime('%H:%M:%S') if last_trade else None,
+        }
+    
     def send_health_report(self):
         """إرسال تقرير صحة النظام"""
         try:
@@ -161,6 +224,7 @@ class SimpleTradingScheduler:
 ❌ الصفقات الخاسرة: {self.stats['loss_trades']}
 💰 صافي الربح: {self.stats['net_profit']}
 
+{self.telegram_bot.format_analytics(self.analytics.summary())}
 🕒 آخر تحديث: {current_time} (UTC+3)
 
 🎯 <i>النظام يعمل بشكل طبيعي</i>
@@ -173,12 +237,16 @@ class SimpleTradingScheduler:
     def run(self):
         """تشغيل الجدولة المبسطة"""
         try:
+            self.reload_config()
             self.start_24h_trading()
             
             logging.info("✅ بدء تشغيل الجدولة المبسطة...")
             
             # الحلقة الرئيسية
             while True:
+                # تطبيق تعديلات الإعدادات قبل الصفقة القادمة
+                self.reload_config()
+                
                 current_time = self.get_utc3_time()
                 
                 # التحقق إذا حان وقت الصفقة
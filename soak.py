@@ -0,0 +1,268 @@
+"""اختبار التحمل الطويل: تشغيل الجدولة آلاف الدورات ومراقبة نمو الذاكرة
+
+python soak.py --cycles 5000
+python soak.py --cycles 500 --browser   # مع متصفح Chromium محلي
+
+بدون --browser تعمل المنصة في وضع المحاكاة: execute_trade و get_trade_result
+لا يلمسان أي صفحة، لذلك النتيجة تغطي الجدولة والتحليلات والتسجيل فقط وليس
+Playwright أو Chromium. مع --browser يفشل الاختبار إذا تعذر تشغيل المتصفح.
+"""
+import os
+import gc
+import sys
+import random
+import argparse
+import tempfile
+import tracemalloc
+from config import TRADING_PAIRS
+from log_pipeline import setup_logging
+from qx_broker import QXBrokerManager
+from telegram_bot import TelegramBot
+from simple_scheduler import SimpleTradingScheduler
+
+# صفحة تداول محلية بعناصر مشابهة لواجهة المنصة
+DEMO_TRADE_PAGE = """<html><body>
+<span>رصيد 10000</span>
+<button>+</button>
+<input placeholder="search">
+{pairs}
+<button>30</button><button>60</button>
+<input type="number" value="1">
+<button>صاعد</button>
+<button>هابط</button>
+{result}
+</body></html>"""
+
+SIGN_IN_PAGE = """<html><body>
+<input type="email"><input type="password"><button type="submit">دخول</button>
+</body></html>"""
+
+
+class LocalBroker(QXBrokerManager):
+    """المنصة الحقيقية مع استبدال الشبكة فقط بصفحات محلية بدل qxbroker.com"""
+
+    def __init__(self, use_browser=False, pairs=TRADING_PAIRS, missing_pairs=('USD/NR',)):
+        # الأزواج غير الموجودة في الصفحة تفشل في search_and_select_pair كما في المنصة
+        self.fixture_pairs = [pair for pair in pairs if pair not in missing_pairs]
+        super().__init__(use_browser=use_browser)
+        self.time_scale = 0
+
+    def create_new_page(self):
+        if not super().create_new_page():
+            return False
+        self.page.route("https://qxbroker.com/**", self.serve_fixture)
+        return True
+
+    def serve_fixture(self, route):
+        """الرد على طلبات qxbroker.com بصفحة محلية"""
+        if 'sign-in' in route.request.url:
+            body = SIGN_IN_PAGE
+        else:
+            pairs = ''.join(f"<div>{pair}</div>" for pair in self.fixture_pairs)
+            if random.random() < 0.5:
+                result = '<span class="green">+0.85 profit</span>'
+            else:
+                result = '<span class="red">-1.00</span>'
+            body = DEMO_TRADE_PAGE.format(pairs=pairs, result=result)
+        route.fulfill(status=200, content_type='text/html; charset=utf-8', body=body)
+
+
+def browser_handles(broker):
+    """عدد السياقات والصفحات المفتوحة في المتصفح"""
+    if not broker.browser:
+        return 0, 0
+    contexts = broker.browser.contexts
+    return len(contexts), sum(len(context.pages) for context in contexts)
+
+
+class LocalTelegramBot(TelegramBot):
+    """بديل محلي لبوت التليجرام - ينسق الرسائل دون إرسالها"""
+
+    def __init__(self):
+        self.token = None
+        self.channel_id = '@soak'
+        self.signup_url = 'https://example.com'
+        self.bot = None
+        self.sent = 0
+        self.last_text = None
+
+    def send_message(self, text, chat_id=None):
+        self.create_signup_button()
+        self.sent += 1
+        self.last_text = text
+        return True
+
+
+def read_rss_kb(pid):
+    """قراءة RSS لعملية من /proc بالكيلوبايت"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def child_pids(pid):
+    """جميع العمليات الفرعية (مثل Chromium)"""
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        return []
+    for child in list(children):
+        children.extend(child_pids(child))
+    return children
+
+
+def process_tree_rss_kb():
+    """RSS للعملية الحالية وعملياتها الفرعية"""
+    pid = os.getpid()
+    own = read_rss_kb(pid)
+    children = sum(read_rss_kb(child) for child in child_pids(pid))
+    return own, children
+
+
+def slope(samples):
+    """ميل خط الانحدار (النمو لكل دورة) بطريقة المربعات الصغرى"""
+    if len(samples) < 2:
+        return 0.0
+    n = len(samples)
+    mean_x = sum(x for x, _ in samples) / n
+    mean_y = sum(y for _, y in samples) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in samples)
+    if not var_x:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in samples) / var_x
+
+
+def run_soak(cycles, warmup, sample_every, heap_threshold, rss_threshold, top, use_browser):
+    """تشغيل دورات الجدولة وإرجاع تقرير النمو"""
+    workdir = tempfile.mkdtemp(prefix='soak-')
+    pipeline = setup_logging(path=os.path.join(workdir, 'soak.jsonl'), echo_stdout=False, flush_interval=0.05)
+
+    broker = LocalBroker(use_browser=use_browser)
+    if use_browser and broker.browser is None:
+        pipeline.stop()
+        return None
+    telegram_bot = LocalTelegramBot()
+    scheduler = SimpleTradingScheduler(qx_manager=broker, telegram_bot=telegram_bot)
+    scheduler.signal_lead_time = 0
+    scheduler.trading_engine.allocator.state_file = os.path.join(workdir, 'pair_stats.json')
+    scheduler.config_reloader.path = os.path.join(workdir, 'config_overrides.json')
+    # الدورات هنا أسرع بكثير من صفقة كل بضع دقائق، لذلك نافذة "آخر ساعة" تصبح ثانية واحدة
+    scheduler.analytics.time_window = 1
+
+    def cycle(i):
+        scheduler.reload_config()
+        scheduler.execute_trade_cycle()
+        scheduler.keep_alive()
+        if i % sample_every == 0:
+            scheduler.send_health_report()
+
+    def settle():
+        # السجلات التي لم تُكتب بعد ليست تسريبًا
+        pipeline.drain()
+        gc.collect()
+
+    # الإحماء حتى تمتلئ الذاكرات المؤقتة والنوافذ المتجددة
+    for i in range(warmup):
+        cycle(i)
+
+    tracemalloc.start(10)
+    settle()
+    baseline = tracemalloc.take_snapshot()
+    heap_samples = []
+    rss_samples = []
+    rows = []
+
+    for i in range(1, cycles + 1):
+        cycle(i)
+        if i % sample_every == 0 or i == cycles:
+            settle()
+            heap, _ = tracemalloc.get_traced_memory()
+            own_rss, child_rss = process_tree_rss_kb()
+            contexts, pages = browser_handles(broker)
+            heap_samples.append((i, heap))
+            rss_samples.append((i, own_rss + child_rss))
+            rows.append((i, heap, own_rss, child_rss, contexts, pages))
+
+    settle()
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ]
+    top_stats = final.filter_traces(filters).compare_to(baseline.filter_traces(filters), 'lineno')[:top]
+
+    broker.close_browser()
+    pipeline.stop()
+
+    heap_growth = slope(heap_samples)
+    rss_growth = slope(rss_samples) * 1024
+    return {
+        'rows': rows,
+        'top_stats': top_stats,
+        'heap_growth': heap_growth,
+        'rss_growth': rss_growth,
+        'messages': telegram_bot.sent,
+        'trades': scheduler.stats['total_trades'],
+        'failed_trades': scheduler.stats['failed_trades'],
+        'browser': broker.browser is not None,
+        'failed': heap_growth > heap_threshold or rss_growth > rss_threshold,
+    }
+
+
+def print_report(report, heap_threshold, rss_threshold):
+    """طباعة تقرير النمو وأكبر مصادر التخصيص"""
+    if report['browser']:
+        print("الوضع: Chromium عبر Playwright (صفحات محلية بدل qxbroker.com)\n")
+    else:
+        print("الوضع: محاكاة - لا يشمل صفحات المنصة أو Playwright أو Chromium (استخدم --browser)\n")
+    print(f"{'cycle':>8} {'heap KB':>10} {'rss KB':>10} {'child KB':>10} {'ctx':>5} {'pages':>6}")
+    for i, heap, own_rss, child_rss, contexts, pages in report['rows']:
+        print(f"{i:>8} {heap // 1024:>10} {own_rss:>10} {child_rss:>10} {contexts:>5} {pages:>6}")
+
+    print(f"\nالصفقات: {report['trades']} - فشل التنفيذ: {report['failed_trades']} - الرسائل: {report['messages']}")
+    print(f"نمو heap لكل دورة: {report['heap_growth']:.1f} bytes (الحد {heap_threshold})")
+    print(f"نمو RSS لكل دورة: {report['rss_growth']:.1f} bytes (الحد {rss_threshold})")
+
+    print("\nأكبر مصادر التخصيص منذ بداية القياس:")
+    for stat in report['top_stats']:
+        print(f"  {stat}")
+
+    print("\n❌ فشل: نمو الذاكرة تجاوز الحد" if report['failed'] else "\n✅ نجح: لا يوجد نمو ملحوظ في الذاكرة")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='اختبار تحمل طويل للجدولة')
+    parser.add_argument('--cycles', type=int, default=3000)
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--sample-every', type=int, default=100)
+    parser.add_argument('--heap-threshold', type=float, default=256, help='bytes لكل دورة')
+    parser.add_argument('--rss-threshold', type=float, default=4096, help='bytes لكل دورة')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--browser', action='store_true', help='تشغيل Chromium محلي عبر Playwright')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    report = run_soak(
+        args.cycles, args.warmup, args.sample_every,
+        args.heap_threshold, args.rss_threshold, args.top, args.browser
+    )
+    if report is None:
+        print("❌ فشل: تعذر تشغيل Chromium عبر Playwright مع --browser")
+        return 1
+    print_report(report, args.heap_threshold, args.rss_threshold)
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
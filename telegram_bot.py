@@ -3,7 +3,7 @@ import telegram
 import logging
 import random
 from datetime import datetime
-from config import UTC3_TZ, TELEGRAM_TOKEN, CHANNEL_ID, QX_SIGNUP_URL
+from config import UTC3_TZ, TELEGRAM_TOKEN, CHANNEL_ID, QX_SIGNUP_URL, TRADE_DURATION
 
 class TelegramBot:
     def __init__(self):
@@ -43,7 +43,7 @@ class TelegramBot:
             logging.error(f"❌ خطأ في إرسال الرسالة: {e}")
             return False
     
-    def send_trade_signal(self, pair, direction, trade_time):
+    def send_trade_signal(self, pair, direction, trade_time, duration=TRADE_DURATION):
         """إرسال إشارة التداول"""
         current_time = self.get_utc3_time()
         text = f"""
@@ -52,7 +52,7 @@ class TelegramBot:
 💰 <b>الزوج:</b> {pair}
 🕒 <b>ميعاد الصفقة:</b> {trade_time} 🎯
 📈 <b>الاتجاه:</b> {direction}
-⏱ <b>المدة:</b> 30 ثانية
+⏱ <b>المدة:</b> {duration} ثانية
 
 ⏰ <b>الوقت الحالي:</b> {current_time} (UTC+3)
 
@@ -60,7 +60,28 @@ class TelegramBot:
 """
         return self.send_message(text)
     
-    def send_trade_result(self, pair, result, stats):
+    def format_analytics(self, analytics):
+        """تنسيق الإحصائيات المتجددة"""
+        if not analytics or not analytics['window_trades']:
+            return ""
+        streak = analytics['current_streak']
+        streak_text = f"{streak} ربح" if streak > 0 else f"{-streak} خسارة"
+        lines = [
+            "📉 <b>الأداء الأخير:</b>",
+            f"• آخر {analytics['window_trades']} صفقة: {analytics['window_win_rate']}%",
+            f"• آخر ساعة: {analytics['hour_win_rate']}% ({analytics['hour_trades']} صفقة)",
+            f"• السلسلة الحالية: {streak_text} (أفضل {analytics['best_win_streak']} / أسوأ {analytics['worst_loss_streak']})",
+        ]
+        if analytics['avg_latency'] is not None:
+            lines.append(f"• متوسط زمن التنفيذ: {analytics['avg_latency']} ثانية")
+        if analytics['best_pair']:
+            lines.append(f"• أفضل زوج: {analytics['best_pair'][1]} ({analytics['best_pair'][0]}%)")
+            lines.append(f"• أضعف زوج: {analytics['worst_pair'][1]} ({analytics['worst_pair'][0]}%)")
+        if analytics['best_hour']:
+            lines.append(f"• أفضل ساعة: {analytics['best_hour'][1]:02d}:00 ({analytics['best_hour'][0]}%)")
+        return "\n".join(lines) + "\n"
+    
+    def send_trade_result(self, pair, result, stats, analytics=None):
         """إرسال نتيجة الصفقة"""
         result_emoji = "🎉 WIN" if result == 'WIN' else "❌ LOSS"
         current_time = self.get_utc3_time()
@@ -78,6 +99,7 @@ class TelegramBot:
 • الصفقات الخاسرة: {stats['loss_trades']}
 • صافي الربح: {stats['net_profit']}
 
+{self.format_analytics(analytics)}
 🚀 <i>استمر في التداول بذكاء!</i>
 """
         return self.send_message(text)
@@ -1,15 +1,23 @@
 import random
 from datetime import datetime
 from config import UTC3_TZ
+from pair_allocator import PairAllocator
 
 class TradingEngine:
     def __init__(self):
-        from config import TRADING_PAIRS
+        from config import TRADING_PAIRS, TRADE_DURATION
         self.pairs = TRADING_PAIRS
+        self.duration = TRADE_DURATION
+        self.allocator = PairAllocator(self.pairs)
+    
+    def update_pairs(self, pairs):
+        """تحديث قائمة الأزواج أثناء التشغيل"""
+        self.pairs = list(pairs)
+        self.allocator.set_pairs(self.pairs)
         
     def analyze_and_decide(self):
-        """تحليل عشوائي واتخاذ قرار التداول"""
-        pair = random.choice(self.pairs)
+        """اختيار الزوج حسب الأداء الأخير واتجاه عشوائي"""
+        pair = self.allocator.choose()
         direction = random.choice(['BUY', 'SELL'])
         
         # وقت UTC+3 مع ثواني = 00
@@ -20,5 +28,17 @@ class TradingEngine:
             'pair': pair,
             'direction': direction,
             'trade_time': trade_time,
-            'duration': 30
+            'duration': self.duration
         }
+    
+    def record_execution(self, pair, success, latency=None):
+        """تسجيل نتيجة تنفيذ الصفقة في المنصة"""
+        self.allocator.record_execution(pair, success, latency)
+    
+    def record_result(self, pair, result):
+        """تسجيل نتيجة الصفقة"""
+        self.allocator.record_result(pair, result)
+    
+    def save_state(self):
+        """حفظ إحصائيات الأزواج"""
+        self.allocator.save()